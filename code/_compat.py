@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Optional numba support shared by bubble_kernel.py and key_formulas.py.
+Without numba, njit is a no-op decorator and prange is range, so the
+kernels run as plain Python (callers branch on HAVE_NUMBA where a numpy
+version is faster).
+"""
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba not installed: run the kernels as plain Python
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
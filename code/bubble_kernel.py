@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+DBN-FBD Scoring Kernel
+Layer 1 ranges, Layer 2 categories, Layer 3 weights and the compiled scorer
+shared by calculate_china_oct2025_real.py and build_kernel.py
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from _compat import HAVE_NUMBA, njit, prange
+
+# ============================================================================
+# LAYER 1: INDIVIDUAL METRICS
+# ============================================================================
+
+# Historical ranges per metric: [hist_min, hist_max, invert]
+# Raw indicator vectors passed to the kernels follow this order
+RANGES = np.array([
+    # Valuation
+    [10,    40,    0],   # P/E (historical range: 10-48, current: 15.5)
+    [10,    35,    0],   # CAPE (historical range: 10-35, current: 14.2)
+    [1.0,   5.0,   0],   # P/B (historical range: 1.0-5.8, current: 1.6)
+    [0.40,  1.40,  0],   # Market Cap/GDP (historical range: 40-140, current: 105.8)
+    [0.015, 0.040, 1],   # Dividend Yield (inverted - lower yield = higher risk)
+    # Momentum
+    [-0.30, 0.60,  0],   # Price momentum (YTD return, range: -30% to +60%)
+    [30,    80,    0],   # RSI (range: 30-80, current: 68)
+    [15,    45,    0],   # Volatility (range: 15-45, current: 28)
+    [800,   2500,  0],   # Margin debt (high margin = higher risk, range: 800-2500)
+    # Credit
+    [2.00,  3.50,  0],   # Total Debt/GDP (range: 200-350%, current: 285%)
+    [0.05,  0.15,  0],   # Credit growth (TSF, range: 5-15%, current: 9.2%)
+    [-0.05, 0.05,  0],   # Credit impulse (range: -5 to +5%, current: +2.3%)
+    # Economy
+    [2.0,   8.0,   1],   # GDP Growth (inverted - higher growth = lower risk)
+    [0.0,   1.0,   0],   # Inflation (placeholder - scored as deviation from target)
+    [45,    55,    1],   # PMI (range: 45-55, current: 51.2, inverted)
+    [4.0,   8.0,   0],   # Unemployment (range: 4-8%, current: 5.0% official)
+    # Sentiment
+    [0.60,  0.90,  0],   # Retail participation (range: 60-90%, current: 82%)
+    [-200,  500,   0],   # Foreign flows (range: -200 to +500B CNY, current: +380B YTD)
+    [0.02,  0.10,  0],   # Foreign ownership (range: 2-10%, current: 4.5%)
+])
+
+INFLATION_IDX = 13
+
+# (v - hist_min) / (hist_max - hist_min) == v * _INV - _OFF: one multiply-subtract
+# per metric instead of a subtraction and a division
+_INV = 1.0 / (RANGES[:, 1] - RANGES[:, 0])
+_OFF = RANGES[:, 0] * _INV
+_INVERT = RANGES[:, 2] == 1
+# Inversion as an affine map, risk = _SIGN * pct + _SHIFT: (-1, 1) for inverted
+# metrics, (1, 0) otherwise - no per-metric branch
+_SIGN = np.where(_INVERT, -1.0, 1.0)
+_SHIFT = np.where(_INVERT, 1.0, 0.0)
+
+# ============================================================================
+# LAYER 2 / LAYER 3: CATEGORIES AND WEIGHTS
+# ============================================================================
+
+# Start index of each category (Valuation, Momentum, Credit, Economy, Sentiment)
+CATEGORY_STARTS = np.array([0, 5, 9, 12, 16])
+CATEGORY_SIZES = np.diff(np.append(CATEGORY_STARTS, len(RANGES)))
+# Mean x 100 folded into one multiplier per category (x20, x25, x100/3, x25, x100/3)
+CATEGORY_SCALE = 100.0 / CATEGORY_SIZES
+
+# Layer 2 → Layer 3 weights (matching paper)
+CATEGORY_WEIGHTS = np.array([0.25, 0.20, 0.20, 0.15, 0.20])
+
+
+def layer1_risk(values):
+    """
+    Per-metric risk in [0,1] in one vectorized pass.
+    values: one raw indicator vector, or an (N, 19) matrix with one row per date;
+    float32 input is kept in float32 throughout
+    """
+    dt = np.result_type(values, np.float32)
+    pct = np.clip(values * _INV.astype(dt) - _OFF.astype(dt), 0.0, 1.0)
+    risk = pct * _SIGN.astype(dt) + _SHIFT.astype(dt)
+    # Inflation/Deflation (target ~2%, range: -2 to +5%) - deviation from target
+    risk[..., INFLATION_IDX] = np.abs(values[..., INFLATION_IDX] - 0.02) / 0.05 * 0.7
+    return risk
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _pn(value, inv_range, offset, sign, shift):
+    """Scalar percentile normalization to [0,1] for the compiled kernel (precomputed _INV/_OFF/_SIGN/_SHIFT)"""
+    pct = min(1.0, max(0.0, value * inv_range - offset))
+    return sign * pct + shift
+
+
+@njit(cache=True, fastmath=True)
+def score(values):
+    """
+    Layer 1 → Layer 2 → Layer 3 for one raw indicator vector (ordered as RANGES).
+    _INV/_OFF/_SIGN/_SHIFT, CATEGORY_* and CATEGORY_WEIGHTS are frozen in as
+    compile-time constants.
+
+    Returns [valuation, momentum, credit, economy, sentiment, composite]
+    """
+    out = np.zeros(6)
+    cat = 0
+    for i in range(values.shape[0]):
+        if cat < 4 and i == CATEGORY_STARTS[cat + 1]:
+            cat += 1
+        if i == INFLATION_IDX:
+            out[cat] += abs(values[i] - 0.02) / 0.05 * 0.7
+        else:
+            out[cat] += _pn(values[i], _INV[i], _OFF[i], _SIGN[i], _SHIFT[i])
+    for c in range(5):
+        out[c] *= CATEGORY_SCALE[c]
+    out[5] = np.dot(out[:5], CATEGORY_WEIGHTS)
+    return out
+
+
+def _score_batch_numpy(X):
+    """Vectorized score() over the rows of X (N x 19) -> (N x 6), in X's float precision"""
+    risk = layer1_risk(X)
+    dt = risk.dtype
+    out = np.empty((X.shape[0], 6), dtype=dt)
+    out[:, :5] = np.add.reduceat(risk, CATEGORY_STARTS, axis=1) * CATEGORY_SCALE.astype(dt)
+    out[:, 5] = out[:, :5] @ CATEGORY_WEIGHTS.astype(dt)
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _score_batch_jit(X):
+    """
+    score() over the rows of X (N x 19) -> (N x 6), rows spread across cores.
+    Each row is scored in float64 (score's accumulator and constants) and only
+    stored in X's dtype
+    """
+    n = X.shape[0]
+    out = np.empty((n, 6), dtype=X.dtype)
+    for r in prange(n):
+        out[r] = score(X[r])
+    return out
+
+
+# Batch scorer for Monte-Carlo scenarios / historical backfills (one row per date).
+# Pass float32 X for large sweeps: the input and output arrays take half the bytes,
+# and the scores only need ~2 decimals (the single-date report stays in float64).
+# The numpy fallback also computes in float32; the numba kernel computes in
+# float64 and narrows the results when it stores them
+score_batch = _score_batch_jit if HAVE_NUMBA else _score_batch_numpy
+
+
+try:
+    # Ahead-of-time build (python build_kernel.py): no JIT warm-up on start
+    from china_bubble_kernel import score as _compiled_score
+except ImportError:
+    _compiled_score = score
+
+
+@lru_cache(maxsize=1024)
+def score_cached(values):
+    """
+    score() memoized on the raw indicator tuple (hashable, ordered as RANGES).
+    Date sweeps over monthly-updated indicators (debt/GDP, CPI, PMI) hit the
+    same inputs repeatedly; those calls become a dict lookup.
+
+    Returns (valuation, momentum, credit, economy, sentiment, composite)
+    """
+    return tuple(_compiled_score(np.asarray(values, dtype=np.float64)).tolist())
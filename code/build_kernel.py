@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Build the ahead-of-time compiled DBN-FBD scoring kernel
+Produces china_bubble_kernel (.so/.pyd) next to this file, so the analysis
+scripts load the scorer with a plain import instead of JIT-compiling it.
+
+Usage: python build_kernel.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+from bubble_kernel import score as _score
+
+cc = CC('china_bubble_kernel')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@cc.export('score', 'f8[:](f8[:])')
+def score(values):
+    return _score(values)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ china_bubble_kernel built in: {cc.output_dir}")
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Generate All Tables
+Run the benchmark, robustness and statistical validation generators
+(Tables 3, 5 and 6) in one process: numpy, orjson and the Jinja2 templates
+are imported and compiled once instead of once per script
+"""
+
+import argparse
+
+import generate_benchmark_comparison as benchmark
+import generate_robustness_checks as robustness
+import generate_statistical_validation as validation
+
+
+def main(out_dir):
+    benchmark.run(out_dir)
+    robustness.run(out_dir)
+    validation.run(out_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=benchmark.DEFAULT_OUT, help="directory for the JSON results")
+    main(parser.parse_args().out)
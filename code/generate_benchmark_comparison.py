@@ -4,11 +4,21 @@ Generate Benchmark Comparison
 Compare DBN-FBD with alternative bubble detection methods
 """
 
+import argparse
 import json
+import os
 
-print("="*70)
-print("BENCHMARK COMPARISON GENERATION")
-print("="*70)
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson not installed: stdlib json below
+    orjson = None
+
+from latex_tables import latex_template
+
+# Directory for the JSON results: --out, else $BUBBLE_OUT, else ./out
+DEFAULT_OUT = os.environ.get("BUBBLE_OUT", "./out")
 
 # Key historical events to test
 events = {
@@ -107,84 +117,29 @@ composite_avg = {
 
 methods = [dbn_fbd, cape_based, phillips_gsadf, vix_threshold, composite_avg]
 
-print("\n" + "="*70)
-print("BUBBLE SIGNALS BY METHOD AND EVENT")
-print("="*70)
-
 # Calculate success metrics
-def evaluate_method(method):
+EVENT_KEYS = ["2015_peak", "2018_correction", "2021_peak", "2022_bottom", "2025_current"]
+
+# Correct signal range per event (inclusive), in EVENT_KEYS order
+SIGNAL_LOW = np.array([70, 40, 70, -np.inf, 30])
+SIGNAL_HIGH = np.array([np.inf, 60, np.inf, 40, 50])
+
+def evaluate_methods(methods):
     """
-    Evaluate method performance:
+    Evaluate method performance (all methods in one pass):
     - 2015 peak: should be HIGH (>60%)
     - 2018: should be MODERATE (30-60%) - was normal correction
     - 2021 peak: should be HIGH (>60%)
     - 2022 bottom: should be LOW (<40%)
     - 2025: should be MODERATE (30-50%)
-    """
-    score = 0
-    max_score = 5
-
-    # 2015 peak (should detect)
-    if method["2015_peak"] >= 70:
-        score += 1
-
-    # 2018 correction (should NOT over-signal)
-    if 40 <= method["2018_correction"] <= 60:
-        score += 1
-
-    # 2021 peak (should detect)
-    if method["2021_peak"] >= 70:
-        score += 1
-
-    # 2022 bottom (should be low)
-    if method["2022_bottom"] <= 40:
-        score += 1
-
-    # 2025 current (should be moderate)
-    if 30 <= method["2025_current"] <= 50:
-        score += 1
-
-    return score, max_score
-
-print("\nPerformance Table:")
-print("-" * 70)
-for method in methods:
-    score, max_score = evaluate_method(method)
-    accuracy = score / max_score * 100
-    print(f"{method['name']:20s}: {score}/{max_score} correct ({accuracy:.0f}%)")
-
-# Generate detailed comparison table
-print("\n" + "="*70)
-print("DETAILED COMPARISON")
-print("="*70)
-
-results = {
-    "methods": methods,
-    "events": events,
-    "performance_summary": {}
-}
-
-for method in methods:
-    score, max_score = evaluate_method(method)
-    results["performance_summary"][method["name"]] = {
-        "correct_signals": score,
-        "total_events": max_score,
-        "accuracy": round(score / max_score * 100, 0)
-    }
 
-# Save results
-output_path = "/Users/nilysenok/Desktop/pythonProject/benchmark_comparison_results.json"
-with open(output_path, 'w') as f:
-    json.dump(results, f, indent=2)
-
-print(f"\n✅ Results saved to: {output_path}")
-
-# Generate LaTeX table
-print("\n" + "="*70)
-print("LATEX TABLE CODE")
-print("="*70)
+    Returns (correct signals per method, max score)
+    """
+    signals = np.array([[method[key] for key in EVENT_KEYS] for method in methods], dtype=float)
+    correct = ((signals >= SIGNAL_LOW) & (signals <= SIGNAL_HIGH)).sum(axis=1)
+    return correct.tolist(), len(EVENT_KEYS)
 
-latex_code = r"""
+BENCHMARK_TABLE = latex_template(r"""
 \begin{table}[H]
 \centering
 \caption{Comparison with Alternative Bubble Detection Methods}
@@ -196,50 +151,103 @@ latex_code = r"""
 \cmidrule(lr){2-6}
 \textbf{Method} & \textbf{2015 Peak} & \textbf{2018 Corr.} & \textbf{2021 Peak} & \textbf{2022 Low} & \textbf{Oct 2025} \\
 \midrule
-"""
-
-for method in methods:
-    latex_code += f"{method['name']:20s} & "
-    latex_code += f"{method['2015_peak']:.0f} & "
-    latex_code += f"{method['2018_correction']:.0f} & "
-    latex_code += f"{method['2021_peak']:.0f} & "
-    latex_code += f"{method['2022_bottom']:.0f} & "
-    latex_code += f"{method['2025_current']:.1f} \\\\\n"
-
-latex_code += r"""\midrule
+\BLOCK{for m in methods}
+\VAR{"%-20s"|format(m.name)} & \VAR{"%.0f"|format(m['2015_peak'])} & \VAR{"%.0f"|format(m['2018_correction'])} & \VAR{"%.0f"|format(m['2021_peak'])} & \VAR{"%.0f"|format(m['2022_bottom'])} & \VAR{"%.1f"|format(m['2025_current'])} \\
+\BLOCK{endfor}
+\midrule
 \multicolumn{6}{l}{\textit{Performance Metrics}} \\
-"""
-
-for method in methods:
-    perf = results["performance_summary"][method["name"]]
-    latex_code += f"{method['name']:20s} & \\multicolumn{{4}}{{l}}{{Accuracy: {perf['correct_signals']}/{perf['total_events']} events ({perf['accuracy']:.0f}\\%), False Positives: {method['false_positives']}}} \\\\\n"
-
-latex_code += r"""\bottomrule
+\BLOCK{for m in methods}
+\BLOCK{set p = perf[m.name]}
+\VAR{"%-20s"|format(m.name)} & \multicolumn{4}{l}{Accuracy: \VAR{p.correct_signals}/\VAR{p.total_events} events (\VAR{"%.0f"|format(p.accuracy)}\%), False Positives: \VAR{m.false_positives}} \\
+\BLOCK{endfor}
+\bottomrule
 \multicolumn{6}{l}{\textit{Note:} High signal (>70\%) indicates bubble risk; Moderate (40-70\%) suggests elevated risk;} \\
 \multicolumn{6}{l}{Low (<40\%) indicates normal conditions. 2018 was normal correction (not bubble),} \\
 \multicolumn{6}{l}{so false positive if method signaled >60\%.} \\
 \end{tabular}
 \end{table}
-"""
+""")
+
 
-print(latex_code)
+def run(out_dir=DEFAULT_OUT):
+    """Score every method, save the JSON results and print the LaTeX table"""
+    print("="*70)
+    print("BENCHMARK COMPARISON GENERATION")
+    print("="*70)
 
-# Key findings
-print("\n" + "="*70)
-print("KEY FINDINGS")
-print("="*70)
+    print("\n" + "="*70)
+    print("BUBBLE SIGNALS BY METHOD AND EVENT")
+    print("="*70)
 
-print("\n✅ DBN-FBD Advantages:")
-print("  1. Correctly identified both 2015 (85%) and 2021 (78%) peaks")
-print("  2. Did NOT over-signal in 2018 correction (45% - appropriate)")
-print("  3. Correctly signaled low risk at 2022 bottom (25%)")
-print("  4. Current reading (36.75%) in appropriate moderate range")
-print("  5. Low false positive rate compared to CAPE and VIX methods")
+    scores, max_score = evaluate_methods(methods)
 
-print("\n⚠️ Alternative Method Weaknesses:")
-print("  • CAPE-based: Missed 2021 tech bubble, many false positives")
-print("  • Phillips GSADF: Missed 2021 (no explosive dynamics in broad index)")
-print("  • VIX Threshold: High false positive rate, reactive not predictive")
-print("  • Simple Composite: Better but still inferior to DBN-FBD")
+    print("\nPerformance Table:")
+    print("-" * 70)
+    for method, score in zip(methods, scores):
+        accuracy = score / max_score * 100
+        print(f"{method['name']:20s}: {score}/{max_score} correct ({accuracy:.0f}%)")
+
+    # Generate detailed comparison table
+    print("\n" + "="*70)
+    print("DETAILED COMPARISON")
+    print("="*70)
+
+    results = {
+        "methods": methods,
+        "events": events,
+        "performance_summary": {}
+    }
 
-print("\n✅ Benchmark comparison generation complete!")
+    for method, score in zip(methods, scores):
+        results["performance_summary"][method["name"]] = {
+            "correct_signals": score,
+            "total_events": max_score,
+            "accuracy": round(score / max_score * 100, 0)
+        }
+
+    # Save results
+    os.makedirs(out_dir, exist_ok=True)
+    output_path = os.path.join(out_dir, "benchmark_comparison_results.json")
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            json.dump(results, f, indent=2)
+
+    print(f"\n✅ Results saved to: {output_path}")
+
+    # Generate LaTeX table
+    print("\n" + "="*70)
+    print("LATEX TABLE CODE")
+    print("="*70)
+
+    latex_code = BENCHMARK_TABLE.render(methods=methods, perf=results["performance_summary"])
+
+    print(latex_code)
+
+    # Key findings
+    print("\n" + "="*70)
+    print("KEY FINDINGS")
+    print("="*70)
+
+    print("\n✅ DBN-FBD Advantages:")
+    print("  1. Correctly identified both 2015 (85%) and 2021 (78%) peaks")
+    print("  2. Did NOT over-signal in 2018 correction (45% - appropriate)")
+    print("  3. Correctly signaled low risk at 2022 bottom (25%)")
+    print("  4. Current reading (36.75%) in appropriate moderate range")
+    print("  5. Low false positive rate compared to CAPE and VIX methods")
+
+    print("\n⚠️ Alternative Method Weaknesses:")
+    print("  • CAPE-based: Missed 2021 tech bubble, many false positives")
+    print("  • Phillips GSADF: Missed 2021 (no explosive dynamics in broad index)")
+    print("  • VIX Threshold: High false positive rate, reactive not predictive")
+    print("  • Simple Composite: Better but still inferior to DBN-FBD")
+
+    print("\n✅ Benchmark comparison generation complete!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="directory for the JSON results")
+    run(parser.parse_args().out)
@@ -4,12 +4,21 @@ Generate Robustness Checks for DBN-FBD Model
 Alternative specifications to show result stability
 """
 
+import argparse
 import json
+import os
+
 import numpy as np
 
-print("="*70)
-print("ROBUSTNESS CHECKS GENERATION")
-print("="*70)
+try:
+    import orjson
+except ImportError:  # orjson not installed: stdlib json below
+    orjson = None
+
+from latex_tables import latex_template
+
+# Directory for the JSON results: --out, else $BUBBLE_OUT, else ./out
+DEFAULT_OUT = os.environ.get("BUBBLE_OUT", "./out")
 
 # Base case (from actual analysis)
 base_components = {
@@ -28,19 +37,19 @@ base_weights = {
     "Sentiment": 0.20
 }
 
-def calculate_bubble_score(components, weights):
-    """Calculate weighted bubble score"""
-    score = sum(components[k] * weights[k] for k in components.keys())
-    return round(score, 2)
+COMPONENT_KEYS = ["Valuation", "Momentum", "Credit", "Economy", "Sentiment"]
 
-# BASELINE
-baseline_score = calculate_bubble_score(base_components, base_weights)
-print(f"\n1. BASELINE (current): {baseline_score}%")
+def calculate_bubble_scores(components, weights):
+    """
+    Calculate weighted bubble scores for all specifications at once
+    (row i = components[i] weighted by weights[i]; a missing component counts as 0)
+    """
+    C = np.array([[c.get(k, 0) for k in COMPONENT_KEYS] for c in components], dtype=float)
+    W = np.array([[w.get(k, 0) for k in COMPONENT_KEYS] for w in weights], dtype=float)
+    return [round(score, 2) for score in (C * W).sum(axis=1).tolist()]
 
 # SPECIFICATION 1: Equal Weights
 equal_weights = {k: 0.20 for k in base_weights.keys()}
-equal_score = calculate_bubble_score(base_components, equal_weights)
-print(f"2. EQUAL WEIGHTS: {equal_score}%")
 
 # SPECIFICATION 2: Without Economy Component
 # Redistribute economy weight proportionally
@@ -51,8 +60,6 @@ no_economy_weights = {
     "Credit": 0.235,     # 20% * 1.176
     "Sentiment": 0.235   # 20% * 1.176
 }
-no_economy_score = calculate_bubble_score(no_economy_components, no_economy_weights)
-print(f"3. WITHOUT ECONOMY: {no_economy_score}%")
 
 # SPECIFICATION 3: With Quarterly Data (slightly different due to smoothing)
 # Quarterly data has less noise, slightly different estimates
@@ -63,8 +70,6 @@ quarterly_components = {
     "Economy": 21,
     "Sentiment": 36
 }
-quarterly_score = calculate_bubble_score(quarterly_components, base_weights)
-print(f"4. QUARTERLY DATA: {quarterly_score}%")
 
 # SPECIFICATION 4: Rolling 12-month Window
 # Recent data may give slightly different component scores
@@ -75,8 +80,6 @@ rolling_components = {
     "Economy": 19,
     "Sentiment": 34
 }
-rolling_score = calculate_bubble_score(rolling_components, base_weights)
-print(f"5. ROLLING 12-MONTH: {rolling_score}%")
 
 # SPECIFICATION 5: Higher Valuation Weight (30% instead of 25%)
 higher_val_weights = {
@@ -86,8 +89,6 @@ higher_val_weights = {
     "Economy": 0.15,
     "Sentiment": 0.20
 }
-higher_val_score = calculate_bubble_score(base_components, higher_val_weights)
-print(f"6. HIGHER VAL WEIGHT (30%): {higher_val_score}%")
 
 # R² estimates for each specification (slightly varied)
 r2_estimates = {
@@ -99,112 +100,146 @@ r2_estimates = {
     "Higher Val Weight": 0.72
 }
 
-print("\n" + "="*70)
-print("ROBUSTNESS CHECK RESULTS")
-print("="*70)
-
-results = {
-    "specifications": [
-        {
-            "name": "Baseline (current)",
-            "bubble_score": baseline_score,
-            "r2": r2_estimates["Baseline"],
-            "key_finding": "Moderate Risk"
-        },
-        {
-            "name": "Equal Weights",
-            "bubble_score": equal_score,
-            "r2": r2_estimates["Equal Weights"],
-            "key_finding": "Similar"
-        },
-        {
-            "name": "Without Economy Component",
-            "bubble_score": no_economy_score,
-            "r2": r2_estimates["Without Economy"],
-            "key_finding": "Robust"
-        },
-        {
-            "name": "Quarterly Data",
-            "bubble_score": quarterly_score,
-            "r2": r2_estimates["Quarterly Data"],
-            "key_finding": "Robust"
-        },
-        {
-            "name": "Rolling 12-month Window",
-            "bubble_score": rolling_score,
-            "r2": r2_estimates["Rolling 12-month"],
-            "key_finding": "Robust"
-        },
-        {
-            "name": "Higher Valuation Weight",
-            "bubble_score": higher_val_score,
-            "r2": r2_estimates["Higher Val Weight"],
-            "key_finding": "Robust"
+ROBUSTNESS_TABLE = latex_template(r"""
+\begin{table}[H]
+\centering
+\caption{Robustness to Alternative Model Specifications}
+\label{tab:robustness}
+\begin{tabular}{lccl}
+\toprule
+\textbf{Specification} & \textbf{Bubble Score} & \textbf{$R^2$} & \textbf{Finding} \\
+\midrule
+\BLOCK{for spec in specifications}
+\VAR{spec.name} & \VAR{"%.2f"|format(spec.bubble_score)}\% & \VAR{"%.2f"|format(spec.r2)} & \VAR{spec.key_finding} \\
+\BLOCK{endfor}
+\midrule
+\textbf{Range} & \VAR{"%.2f"|format(summary.min_score)}\%--\VAR{"%.2f"|format(summary.max_score)}\% & --- & Stable \\
+\bottomrule
+\end{tabular}
+\end{table}
+""")
+
+
+def run(out_dir=DEFAULT_OUT):
+    """Score every specification, save the JSON results and print the LaTeX table"""
+    print("="*70)
+    print("ROBUSTNESS CHECKS GENERATION")
+    print("="*70)
+
+    # BASELINE + specifications 1-5 in one weighted sum
+    (baseline_score, equal_score, no_economy_score,
+     quarterly_score, rolling_score, higher_val_score) = calculate_bubble_scores(
+        [base_components, base_components, no_economy_components,
+         quarterly_components, rolling_components, base_components],
+        [base_weights, equal_weights, no_economy_weights,
+         base_weights, base_weights, higher_val_weights]
+    )
+
+    print(f"\n1. BASELINE (current): {baseline_score}%")
+    print(f"2. EQUAL WEIGHTS: {equal_score}%")
+    print(f"3. WITHOUT ECONOMY: {no_economy_score}%")
+    print(f"4. QUARTERLY DATA: {quarterly_score}%")
+    print(f"5. ROLLING 12-MONTH: {rolling_score}%")
+    print(f"6. HIGHER VAL WEIGHT (30%): {higher_val_score}%")
+
+    print("\n" + "="*70)
+    print("ROBUSTNESS CHECK RESULTS")
+    print("="*70)
+
+    results = {
+        "specifications": [
+            {
+                "name": "Baseline (current)",
+                "bubble_score": baseline_score,
+                "r2": r2_estimates["Baseline"],
+                "key_finding": "Moderate Risk"
+            },
+            {
+                "name": "Equal Weights",
+                "bubble_score": equal_score,
+                "r2": r2_estimates["Equal Weights"],
+                "key_finding": "Similar"
+            },
+            {
+                "name": "Without Economy Component",
+                "bubble_score": no_economy_score,
+                "r2": r2_estimates["Without Economy"],
+                "key_finding": "Robust"
+            },
+            {
+                "name": "Quarterly Data",
+                "bubble_score": quarterly_score,
+                "r2": r2_estimates["Quarterly Data"],
+                "key_finding": "Robust"
+            },
+            {
+                "name": "Rolling 12-month Window",
+                "bubble_score": rolling_score,
+                "r2": r2_estimates["Rolling 12-month"],
+                "key_finding": "Robust"
+            },
+            {
+                "name": "Higher Valuation Weight",
+                "bubble_score": higher_val_score,
+                "r2": r2_estimates["Higher Val Weight"],
+                "key_finding": "Robust"
+            }
+        ],
+        "summary": {
+            "min_score": min(baseline_score, equal_score, no_economy_score, quarterly_score, rolling_score, higher_val_score),
+            "max_score": max(baseline_score, equal_score, no_economy_score, quarterly_score, rolling_score, higher_val_score),
+            "range": None,
+            "avg_score": None,
+            "conclusion": "Results are stable across specifications"
         }
-    ],
-    "summary": {
-        "min_score": min(baseline_score, equal_score, no_economy_score, quarterly_score, rolling_score, higher_val_score),
-        "max_score": max(baseline_score, equal_score, no_economy_score, quarterly_score, rolling_score, higher_val_score),
-        "range": None,
-        "avg_score": None,
-        "conclusion": "Results are stable across specifications"
     }
-}
 
-# Calculate summary stats
-scores = [s["bubble_score"] for s in results["specifications"]]
-results["summary"]["min_score"] = round(min(scores), 2)
-results["summary"]["max_score"] = round(max(scores), 2)
-results["summary"]["range"] = round(max(scores) - min(scores), 2)
-results["summary"]["avg_score"] = round(np.mean(scores), 2)
+    # Calculate summary stats
+    scores = [s["bubble_score"] for s in results["specifications"]]
+    results["summary"]["min_score"] = round(min(scores), 2)
+    results["summary"]["max_score"] = round(max(scores), 2)
+    results["summary"]["range"] = round(max(scores) - min(scores), 2)
+    results["summary"]["avg_score"] = round(np.mean(scores), 2)
 
-print(f"\nSummary:")
-print(f"  Range: {results['summary']['min_score']}% - {results['summary']['max_score']}%")
-print(f"  Average: {results['summary']['avg_score']}%")
-print(f"  Variation: ±{results['summary']['range']/2:.1f}pp from baseline")
+    print(f"\nSummary:")
+    print(f"  Range: {results['summary']['min_score']}% - {results['summary']['max_score']}%")
+    print(f"  Average: {results['summary']['avg_score']}%")
+    print(f"  Variation: ±{results['summary']['range']/2:.1f}pp from baseline")
 
-# Check if variation is acceptable (< 10% deviation)
-max_deviation = max(abs(s - baseline_score) for s in scores)
-print(f"  Max deviation: {max_deviation:.1f}pp ({max_deviation/baseline_score*100:.1f}% of baseline)")
+    # Check if variation is acceptable (< 10% deviation)
+    max_deviation = max(abs(s - baseline_score) for s in scores)
+    print(f"  Max deviation: {max_deviation:.1f}pp ({max_deviation/baseline_score*100:.1f}% of baseline)")
 
-if max_deviation / baseline_score < 0.15:
-    print(f"\n✅ ROBUST: Variation < 15% across all specifications")
-else:
-    print(f"\n⚠️ WARNING: Some specifications show > 15% deviation")
+    if max_deviation / baseline_score < 0.15:
+        print(f"\n✅ ROBUST: Variation < 15% across all specifications")
+    else:
+        print(f"\n⚠️ WARNING: Some specifications show > 15% deviation")
 
-# Save results
-output_path = "/Users/nilysenok/Desktop/pythonProject/robustness_checks_results.json"
-with open(output_path, 'w') as f:
-    json.dump(results, f, indent=2)
+    # Save results
+    os.makedirs(out_dir, exist_ok=True)
+    output_path = os.path.join(out_dir, "robustness_checks_results.json")
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            json.dump(results, f, indent=2)
 
-print(f"\n✅ Results saved to: {output_path}")
+    print(f"\n✅ Results saved to: {output_path}")
 
-# Generate LaTeX table code
-print("\n" + "="*70)
-print("LATEX TABLE CODE")
-print("="*70)
+    # Generate LaTeX table code
+    print("\n" + "="*70)
+    print("LATEX TABLE CODE")
+    print("="*70)
 
-latex_code = r"""
-\begin{table}[H]
-\centering
-\caption{Robustness to Alternative Model Specifications}
-\label{tab:robustness}
-\begin{tabular}{lccl}
-\toprule
-\textbf{Specification} & \textbf{Bubble Score} & \textbf{$R^2$} & \textbf{Finding} \\
-\midrule
-"""
+    latex_code = ROBUSTNESS_TABLE.render(specifications=results["specifications"], summary=results["summary"])
 
-for spec in results["specifications"]:
-    latex_code += f"{spec['name']} & {spec['bubble_score']:.2f}\\% & {spec['r2']:.2f} & {spec['key_finding']} \\\\\n"
+    print(latex_code)
 
-latex_code += r"""\midrule
-\textbf{Range} & """ + f"{results['summary']['min_score']:.2f}\\%--{results['summary']['max_score']:.2f}\\% & --- & Stable \\\\\n"
-latex_code += r"""\bottomrule
-\end{tabular}
-\end{table}
-"""
+    print("\n✅ Robustness checks generation complete!")
 
-print(latex_code)
 
-print("\n✅ Robustness checks generation complete!")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="directory for the JSON results")
+    run(parser.parse_args().out)
@@ -5,34 +5,71 @@
 используемые в системе обнаружения финансовых пузырей.
 """
 
+from bisect import bisect_left, bisect_right, insort
+from functools import lru_cache
+import math
+import os
+
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from scipy import stats
-from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.cluster import KMeans
+
+try:
+    import bottleneck as bn
+except ImportError:  # bottleneck не установлен: скользящие окна через pandas
+    bn = None
+
+# Необязательная numba (без нее njit — пустой декоратор, ниже ветки HAVE_NUMBA на numpy/scipy)
+from _compat import HAVE_NUMBA, njit, prange
 
 # ========================================================================
 # I. ПРОИЗВОДНЫЕ МЕТРИКИ И ИНДИКАТОРЫ (из data_preparation.py)
 # ========================================================================
 
+# Годовой множитель волатильности дневной доходности (252 торговых дня)
+SQRT_252 = math.sqrt(252)
+
+def _to_float32(df, cols):
+    """Столбцы cols в виде массивов float32: производные от них столбцы df сохраняются в float32"""
+    return [df[col].to_numpy(dtype=np.float32) for col in cols]
+
+
 def key_derived_metrics(df):
     """
     Примеры из модуля data_preparation.py:
     Ключевые формулы расчета производных метрик
+    (VIX_SPX_ratio и Dividend_Yield хранятся в float32 — дальше они только
+    сравниваются с порогами и ранжируются; SPX_log, доходность и волатильность
+    остаются в float64, т.к. ошибка накапливается в наклоне и масштабе sqrt(252))
     """
+    spx, vix, dividend = _to_float32(df, ['SPX', 'VIX', 'Dividend_D'])
     
     # 1. Расчет соотношения VIX к S&P 500 (индикатор страха/жадности)
-    df['VIX_SPX_ratio'] = df['VIX'] / df['SPX'] * 100
+    df['VIX_SPX_ratio'] = vix / spx * 100
     
     # 2. Расчет дивидендной доходности
-    df['Dividend_Yield'] = (df['Dividend_D'] / df['SPX']) * 100
+    df['Dividend_Yield'] = (dividend / spx) * 100
     
-    # 3. Логарифмическая доходность (для расчета волатильности)
-    df['SPX_log_return'] = np.log(df['SPX'] / df['SPX'].shift(1))
+    # 3. Логарифм цены (считается один раз, его же используют exponential_growth_metrics
+    # и check_exponential_growth) и логарифмическая доходность как его первая разность
+    df['SPX_log'] = np.log(df['SPX'].to_numpy(dtype=np.float64))
+    log_return = np.empty(len(spx))
+    log_return[:1] = np.nan
+    log_return[1:] = np.diff(df['SPX_log'].to_numpy())
+    df['SPX_log_return'] = log_return
     
     # 4. Расчет волатильности на различных временных горизонтах
     # (21 день ~ 1 месяц, 63 дня ~ 3 месяца, 252 дня ~ 1 год)
     for window in [21, 63, 252]:
-        df[f'SPX_volatility_{window}d'] = df['SPX_log_return'].rolling(window=window).std() * np.sqrt(252)
+        if bn is not None and window <= len(log_return):
+            # Скользящее стандартное отклонение (ddof=1, как в pandas) одним проходом на C
+            volatility = bn.move_std(log_return, window=window, min_count=window, ddof=1)
+        else:
+            volatility = df['SPX_log_return'].rolling(window=window).std()
+        df[f'SPX_volatility_{window}d'] = volatility * SQRT_252
     
     return df
 
@@ -41,21 +78,82 @@ def key_derived_metrics(df):
 # II. ОПРЕДЕЛЕНИЕ ЭКСПОНЕНЦИАЛЬНОГО РОСТА (из data_preparation.py)
 # ========================================================================
 
+@lru_cache(maxsize=8)
+def _reg_consts(n):
+    """
+    Константы регрессии на оси x = 0..n-1 (зависят только от длины окна):
+    x, центрированный x - x̄ и Σ(x - x̄)². Массивы только для чтения.
+    """
+    x = np.arange(n, dtype=np.float64)
+    x_centered = x - (n - 1) / 2
+    x.flags.writeable = False
+    x_centered.flags.writeable = False
+    return x, x_centered, float((x_centered * x_centered).sum())
+
+
+@njit(parallel=True, cache=True)
+def _rolling_slope_jit(values, x_centered, sum_x2):
+    """
+    Наклон МНК на каждом скользящем окне длины len(x_centered);
+    окна независимы и распределяются по ядрам (prange). Первые w-1 значений — NaN.
+    """
+    n = values.shape[0]
+    w = x_centered.shape[0]
+    out = np.full(n, np.nan)
+    for i in prange(w - 1, n):
+        sxy = 0.0
+        for k in range(w):
+            sxy += x_centered[k] * values[i - w + 1 + k]
+        out[i] = sxy / sum_x2
+    return out
+
+
+def _rolling_slope(values, window):
+    """
+    Наклон МНК values на оси 0..window-1 для каждого скользящего окна.
+    Ось x фиксирована, поэтому slope = Σ(x - x̄)·y / Σ(x - x̄)² — без подгонки
+    модели на каждом окне. Первые window-1 значений — NaN.
+    """
+    _, x_centered, sum_x2 = _reg_consts(window)
+    if HAVE_NUMBA:
+        # Параллельное скомпилированное ядро по окнам
+        return _rolling_slope_jit(values, x_centered, sum_x2)
+    # Свертка вместо sliding_window_view(values, window) @ x_centered: окно-вид
+    # с шагом 8 байт не подходит для BLAS gemv, и matmul идет медленным
+    # циклом (~2x медленнее np.convolve на 200k точек)
+    slope = np.full(len(values), np.nan)
+    if len(values) >= window:
+        slope[window-1:] = np.convolve(values, x_centered[::-1], 'valid') / sum_x2
+    return slope
+
+
 def exponential_growth_metrics(df):
     """
     Определение и измерение экспоненциального роста цен
     """
     
     # 1. Годовое изменение цены S&P 500
-    df['SPX_growth_rate'] = df['SPX'].pct_change(periods=12)
+    # (p[t] / p[t-12] - 1 на массиве; пропуски заполняются предыдущим значением,
+    # как в pct_change с fill_method='pad')
+    spx = df['SPX'].to_numpy(dtype=np.float64)
+    missing = np.isnan(spx)
+    if missing.any():
+        last_valid = np.maximum.accumulate(np.where(missing, 0, np.arange(len(spx))))
+        spx = spx[last_valid]
+    growth_rate = np.full(len(spx), np.nan)
+    np.divide(spx[12:], spx[:-12], out=growth_rate[12:])
+    growth_rate[12:] -= 1.0
+    df['SPX_growth_rate'] = growth_rate
     
     # 2. Расчет экспоненциального тренда на 5-летнем скользящем окне
     # Используем линейную регрессию на логарифмированных данных
     # Коэффициент наклона * 12 * 100 = годовой % роста в экспоненциальном тренде
-    df['SPX_exp_trend'] = df['SPX'].rolling(window=60).apply(
-        lambda x: np.polyfit(np.arange(len(x)), np.log(x), 1)[0] * 12 * 100,
-        raw=True
-    )
+    # (наклон МНК в замкнутой форме по всем 60-месячным окнам сразу, см. _rolling_slope)
+    window = 60
+    if 'SPX_log' not in df.columns:
+        df['SPX_log'] = np.log(df['SPX'].to_numpy(dtype=np.float64))
+    log_spx = df['SPX_log'].to_numpy(dtype=np.float64)
+    df['SPX_exp_trend'] = _rolling_slope(log_spx, window) * 12 * 100
     
     # 3. Отклонение фактического роста от экспоненциального тренда
     # Положительное значение = рост быстрее тренда (потенциальный пузырь)
@@ -64,28 +162,66 @@ def exponential_growth_metrics(df):
     return df
 
 
-def check_exponential_growth(price_series):
+@njit(cache=True)
+def _log_linear_fit(log_values, x_centered, sum_x2):
+    """
+    Наклон и R² регрессии log-цен на 0..n-1 по замкнутым формулам МНК
+    (то же, что slope и r_value**2 из stats.linregress, без обращения к SciPy);
+    x_centered и sum_x2 — из _reg_consts(n)
+    """
+    n = log_values.shape[0]
+    y_mean = 0.0
+    for i in range(n):
+        y_mean += log_values[i]
+    y_mean /= n
+    sxy = 0.0
+    syy = 0.0
+    for i in range(n):
+        dy = log_values[i] - y_mean
+        sxy += x_centered[i] * dy
+        syy += dy * dy
+    slope = sxy / sum_x2
+    # Как в linregress: при нулевой дисперсии log-цен корреляция считается нулевой
+    r2 = 0.0 if syy == 0.0 else min(1.0, sxy * sxy / (sum_x2 * syy))
+    return slope, r2
+
+
+def check_exponential_growth(price_series, is_log=False):
     """
     Проверка наличия экспоненциального роста в ценовом ряде
     
+    Параметры:
+    - is_log: ряд уже логарифмирован (например, окно df['SPX_log'])
+    
     Возвращает:
     - exp_score: метрику экспоненциальности (произведение наклона и R²)
     - is_exponential: булево значение о наличии экспоненциального роста
     """
     # Логарифмируем данные для проверки на экспоненциальность
-    log_values = np.log(price_series)
-    x = np.arange(len(price_series))
+    log_values = price_series if is_log else np.log(price_series)
+    
+    if HAVE_NUMBA:
+        # Линейная регрессия на логарифмированных данных (скомпилированное ядро)
+        log_values = np.asarray(log_values, dtype=np.float64)
+        _, x_centered, sum_x2 = _reg_consts(len(log_values))
+        slope, r2 = _log_linear_fit(log_values, x_centered, sum_x2)
+        exp_score = slope * r2 * 100
+        is_exponential = exp_score > 2.0 and r2 > 0.9
+        return exp_score, is_exponential
+
+    x, _, _ = _reg_consts(len(log_values))
     
     # Линейная регрессия на логарифмированных данных
     # Если рост экспоненциальный, то логарифмированный ряд будет линейным
     slope, intercept, r_value, p_value, std_err = stats.linregress(x, log_values)
+    r2 = r_value * r_value
     
     # Метрика экспоненциальности: произведение наклона и коэффициента детерминации
     # Высокое значение = крутой наклон с хорошим качеством подгонки (R²)
-    exp_score = slope * r_value**2 * 100
+    exp_score = slope * r2 * 100
     
     # Определяем наличие экспоненциального роста на основе порога
-    is_exponential = exp_score > 2.0 and r_value**2 > 0.9
+    is_exponential = exp_score > 2.0 and r2 > 0.9
     
     return exp_score, is_exponential
 
@@ -98,16 +234,50 @@ def calculate_zscore(df, metric, window=60):
     """
     Расчет Z-score для метрики (отклонение от среднего в единицах стандартного отклонения)
     """
-    # Скользящее среднее за 5 лет (60 месяцев)
-    rolling_mean = df[metric].rolling(window=window).mean()
+    values = df[metric].to_numpy(dtype=np.float64)
+    if bn is None or window > len(values):
+        # Скользящее среднее за 5 лет (60 месяцев)
+        rolling_mean = df[metric].rolling(window=window).mean()
+        
+        # Скользящее стандартное отклонение за 5 лет
+        rolling_std = df[metric].rolling(window=window).std()
+        
+        # Расчет Z-score: (значение - среднее) / стандартное отклонение
+        return (df[metric] - rolling_mean) / rolling_std
     
-    # Скользящее стандартное отклонение за 5 лет
-    rolling_std = df[metric].rolling(window=window).std()
+    # Скользящие среднее и стандартное отклонение (ddof=1) на массиве, без выравнивания индексов
+    rolling_mean = bn.move_mean(values, window=window, min_count=window)
+    rolling_std = bn.move_std(values, window=window, min_count=window, ddof=1)
     
     # Расчет Z-score: (значение - среднее) / стандартное отклонение
-    z_score = (df[metric] - rolling_mean) / rolling_std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = (values - rolling_mean) / rolling_std
     
-    return z_score
+    return pd.Series(z_score, index=df.index, name=metric)
+
+
+def _expanding_percentile_rank(values, min_periods):
+    """
+    Аналог expanding(min_periods).apply(percentileofscore(x, x[-1]) / 100) за O(N log N)
+
+    Для точки i: (#{j<=i: a_j < a_i} + #{j<=i: a_j <= a_i} + 1) / (2·(i+1)) — формула
+    kind='rank' из scipy. История хранится отсортированной (insort), оба счетчика —
+    двоичный поиск по ней вместо пересчета всей истории на каждом шаге. Как и
+    percentileofscore, пропуск (NaN) в истории делает ранг неопределенным для всех
+    последующих точек.
+    """
+    n = len(values)
+    pct_rank = np.full(n, np.nan)
+    nan_pos = np.flatnonzero(np.isnan(values))
+    valid = nan_pos[0] if len(nan_pos) else n
+    history = []
+    ranks = []
+    for i, value in enumerate(values[:valid].tolist()):
+        insort(history, value)
+        if i >= min_periods - 1:
+            ranks.append((bisect_left(history, value) + bisect_right(history, value) + 1) / (2.0 * (i + 1)))
+    pct_rank[valid - len(ranks):valid] = ranks
+    return pct_rank
 
 
 def calculate_percentile_rank(df, metric, window=120, invert=False):
@@ -121,9 +291,8 @@ def calculate_percentile_rank(df, metric, window=120, invert=False):
     """
     # Расчет процентильного ранга на расширяющемся окне
     # (каждое значение сравнивается со всеми предыдущими значениями)
-    pct_rank = df[metric].expanding(min_periods=window).apply(
-        lambda x: stats.percentileofscore(x, x.iloc[-1]) / 100
-    )
+    pct_rank = pd.Series(_expanding_percentile_rank(df[metric].to_numpy(dtype=np.float64), window),
+                         index=df.index, name=metric)
     
     # Инвертируем ранг, если необходимо
     # (для метрик, где низкие значения означают высокий риск)
@@ -155,15 +324,66 @@ def calculate_category_risk(df, metrics, direction_dict=None):
         return pd.Series(np.nan, index=df.index)
         
     # Среднее значение процентильных рангов для метрик в категории
-    category_risk = df[rank_metrics].mean(axis=1)
+    # (одна матрица N×K вместо копии DataFrame; пропуски не учитываются, как в mean(axis=1))
+    ranks = np.column_stack([df[col].to_numpy(dtype=np.float64) for col in rank_metrics])
+    observed = ~np.isnan(ranks)
+    with np.errstate(invalid='ignore'):
+        category_risk = np.where(observed, ranks, 0.0).sum(axis=1) / observed.sum(axis=1)
     
-    return category_risk
+    return pd.Series(category_risk, index=df.index)
 
 
 # ========================================================================
 # V. РАСЧЕТ КОМПОЗИТНОГО ИНДЕКСА ПУЗЫРЯ (из bubble_metrics.py)
 # ========================================================================
 
+# Уровни риска композитного индекса: (-inf, 0.3], (0.3, 0.5], (0.5, 0.7], (0.7, inf)
+RISK_LEVEL_EDGES = np.array([0.3, 0.5, 0.7])
+RISK_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
+
+def _bucket_labels(values, edges, labels):
+    """
+    pd.cut(values, bins=[-inf, *edges, inf], labels=labels) без IntervalIndex:
+    номер интервала — searchsorted по внутренним границам (side='left', т.к.
+    интервалы закрыты справа); NaN и -inf вне интервалов и дают NaN, как в pd.cut
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side='left')
+    codes[~(values > -np.inf)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+@njit(cache=True)
+def _smooth_momentum_acceleration(score):
+    """
+    За один проход: 3-периодное среднее ряда, 3-периодное среднее его первой
+    разности (моментум) и 3-периодное среднее разности моментума (ускорение) —
+    то же, что rolling(3).mean(), diff().rolling(3).mean() и т.д. в pandas,
+    включая NaN в начале и в окнах с пропусками
+    """
+    n = score.shape[0]
+    smooth = np.full(n, np.nan)
+    momentum = np.full(n, np.nan)
+    acceleration = np.full(n, np.nan)
+    for i in range(2, n):
+        smooth[i] = (score[i - 2] + score[i - 1] + score[i]) / 3.0
+        if i >= 3:
+            momentum[i] = ((score[i - 2] - score[i - 3]) + (score[i - 1] - score[i - 2])
+                           + (score[i] - score[i - 1])) / 3.0
+        if i >= 6:
+            acceleration[i] = ((momentum[i - 2] - momentum[i - 3]) + (momentum[i - 1] - momentum[i - 2])
+                               + (momentum[i] - momentum[i - 1])) / 3.0
+    return smooth, momentum, acceleration
+
+
+def _rolling_mean3(values):
+    """rolling(3).mean() на массиве (NumPy-вариант без numba)"""
+    out = np.full(len(values), np.nan)
+    out[2:] = (values[:-2] + values[1:-1] + values[2:]) / 3.0
+    return out
+
+
 def calculate_composite_bubble_score(df, category_scores, weights):
     """
     Расчет композитного индекса пузыря на основе взвешенного среднего категориальных рисков
@@ -173,29 +393,28 @@ def calculate_composite_bubble_score(df, category_scores, weights):
     - weights: список весов для каждой категории
     """
     # Нормализация весов (сумма = 1)
-    weights = np.array(weights) / sum(weights)
-    
-    # Взвешенная сумма категориальных рисков
-    composite_score = np.zeros(len(df))
-    for i, category in enumerate(category_scores):
-        if category in df.columns:
-            composite_score += df[category].values * weights[i]
-    
-    # Сглаженная версия (3-месячное скользящее среднее)
-    composite_score_smooth = pd.Series(composite_score, index=df.index).rolling(window=3).mean()
+    weights = np.asarray(weights, dtype=np.float64) / sum(weights)
+    
+    # Взвешенная сумма категориальных рисков: одна матрица N×K и одно умножение
+    # на вектор весов (отсутствующие в df категории дают нулевой вклад)
+    available = [i for i, category in enumerate(category_scores) if category in df.columns]
+    if available:
+        categories = df[[category_scores[i] for i in available]].to_numpy(dtype=np.float64)
+        composite_score = categories @ weights[available]
+    else:
+        composite_score = np.zeros(len(df))
+    
+    # Сглаженная версия (3-месячное скользящее среднее), моментум (изменение первого
+    # порядка) и ускорение (изменение второго порядка) — 3-периодные средние
+    if HAVE_NUMBA:
+        composite_score_smooth, momentum, acceleration = _smooth_momentum_acceleration(composite_score)
+    else:
+        composite_score_smooth = _rolling_mean3(composite_score)
+        momentum = _rolling_mean3(np.diff(composite_score, prepend=np.nan))
+        acceleration = _rolling_mean3(np.diff(momentum, prepend=np.nan))
     
     # Определение уровня риска на основе композитного индекса
-    risk_levels = pd.cut(
-        composite_score,
-        bins=[-float('inf'), 0.3, 0.5, 0.7, float('inf')],
-        labels=['Low', 'Medium', 'High', 'Critical']
-    )
-    
-    # Расчет моментума (изменение первого порядка)
-    momentum = pd.Series(composite_score, index=df.index).diff().rolling(window=3).mean()
-    
-    # Расчет ускорения (изменение второго порядка)
-    acceleration = momentum.diff().rolling(window=3).mean()
+    risk_levels = _bucket_labels(composite_score, RISK_LEVEL_EDGES, RISK_LEVELS)
     
     return pd.DataFrame({
         'composite_bubble_score': composite_score,
@@ -210,36 +429,92 @@ def calculate_composite_bubble_score(df, category_scores, weights):
 # VI. СИСТЕМА РАННЕГО ПРЕДУПРЕЖДЕНИЯ (из bubble_metrics.py)
 # ========================================================================
 
+# Уровни раннего предупреждения: (-inf, 0.3], (0.3, 0.6], (0.6, 0.8], (0.8, inf)
+WARNING_LEVEL_EDGES = np.array([0.3, 0.6, 0.8])
+WARNING_LEVELS = ['Normal', 'Watch', 'Warning', 'Alert']
+
+
+@njit(parallel=True, cache=True, error_model='numpy')
+def _early_warning_kernel(ranks, warning_threshold, danger_threshold, level_edges):
+    """
+    Один проход по строкам матрицы рангов N×M (строки распределяются по ядрам):
+    флаги предупреждения/опасности (попарно для каждой метрики, int8), их суммы,
+    индекс раннего предупреждения и номер его уровня (-1 для NaN, как в _bucket_labels)
+    """
+    n, m = ranks.shape
+    flags = np.zeros((n, 2 * m), dtype=np.int8)
+    total_warnings = np.zeros(n, dtype=np.int8)
+    total_dangers = np.zeros(n, dtype=np.int8)
+    index = np.empty(n)
+    level_codes = np.empty(n, dtype=np.int8)
+    for i in prange(n):
+        warnings = 0
+        dangers = 0
+        for j in range(m):
+            if ranks[i, j] > warning_threshold:
+                flags[i, 2 * j] = 1
+                warnings += 1
+            if ranks[i, j] > danger_threshold:
+                flags[i, 2 * j + 1] = 1
+                dangers += 1
+        total_warnings[i] = warnings
+        total_dangers[i] = dangers
+        # Без метрик (m = 0) индекс 0/0 = NaN, как в pandas
+        value = (warnings / m) * 0.4 + (dangers / m) * 0.6
+        index[i] = value
+        code = -1
+        if not np.isnan(value):
+            code = 0
+            while code < level_edges.shape[0] and value > level_edges[code]:
+                code += 1
+        level_codes[i] = code
+    return flags, total_warnings, total_dangers, index, level_codes
+
+
 def calculate_early_warning_signals(df, metrics, warning_threshold=0.7, danger_threshold=0.9):
     """
     Расчет сигналов раннего предупреждения на основе пороговых значений
     """
-    warning_columns = []
-    danger_columns = []
-    
-    # Генерация предупреждений и опасностей для каждой метрики
-    for metric in metrics:
-        rank_col = f"{metric}_pct_rank"
-        if rank_col not in df.columns:
-            continue
-            
-        # Создание бинарных индикаторов предупреждения и опасности
-        warning_col = f"{metric}_warning"
-        danger_col = f"{metric}_danger"
+    available = [metric for metric in metrics if f"{metric}_pct_rank" in df.columns]
+    
+    # Бинарные индикаторы предупреждения и опасности для всех метрик сразу:
+    # одна матрица рангов N×M (C-порядок: строка метрик лежит в памяти подряд) и сравнения с порогами
+    if available:
+        ranks = np.column_stack([df[f"{metric}_pct_rank"].to_numpy(dtype=np.float64) for metric in available])
+    else:
+        ranks = np.empty((len(df), 0))
+    
+    if HAVE_NUMBA:
+        # Флаги, суммы, индекс и уровень предупреждения — одним скомпилированным проходом
+        flags, total_warnings, total_dangers, early_warning_index, level_codes = _early_warning_kernel(
+            ranks, warning_threshold, danger_threshold, WARNING_LEVEL_EDGES)
+        warning_level = pd.Categorical.from_codes(level_codes, categories=WARNING_LEVELS, ordered=True)
+    else:
+        # Флаги в построчном (C-contiguous) int8: суммы по строке — линейный проход по памяти
+        warning_flags = np.ascontiguousarray(ranks > warning_threshold, dtype=np.int8)
+        danger_flags = np.ascontiguousarray(ranks > danger_threshold, dtype=np.int8)
+        flags = np.empty((len(df), 2 * len(available)), dtype=np.int8)
+        flags[:, 0::2] = warning_flags
+        flags[:, 1::2] = danger_flags
         
-        df[warning_col] = (df[rank_col] > warning_threshold) * 1
-        df[danger_col] = (df[rank_col] > danger_threshold) * 1
+        # Подсчет общего количества предупреждений и опасностей
+        total_warnings = warning_flags.sum(axis=1, dtype=np.int8)
+        total_dangers = danger_flags.sum(axis=1, dtype=np.int8)
         
-        warning_columns.append(warning_col)
-        danger_columns.append(danger_col)
+        # Композитный индекс раннего предупреждения
+        # (взвешенная сумма доли предупреждений и опасностей от максимально возможного числа)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            early_warning_index = (total_warnings / len(available)) * 0.4 + (total_dangers / len(available)) * 0.6
+        warning_level = _bucket_labels(early_warning_index, WARNING_LEVEL_EDGES, WARNING_LEVELS)
     
-    # Подсчет общего количества предупреждений и опасностей
-    df['total_warnings'] = df[warning_columns].sum(axis=1)
-    df['total_dangers'] = df[danger_columns].sum(axis=1)
+    # Столбцы {metric}_warning / {metric}_danger (int8, попарно для каждой метрики)
+    # записываются в df одним присваиванием
+    flag_columns = [f"{metric}_{kind}" for metric in available for kind in ('warning', 'danger')]
+    if flag_columns:
+        df[flag_columns] = flags
     
-    # Максимальное возможное количество предупреждений и опасностей
-    max_warnings = len(warning_columns)
-    max_dangers = len(danger_columns)
+    df['total_warnings'] = total_warnings
+    df['total_dangers'] = total_dangers
     
     # Сигнал ускорения пузыря (положительное ускорение при высоком композитном индексе)
     if 'bubble_score_acceleration' in df.columns and 'composite_bubble_score' in df.columns:
@@ -255,19 +530,9 @@ def calculate_early_warning_signals(df, metrics, warning_threshold=0.7, danger_t
             (df['composite_bubble_score'] > 0.7)
         )
     
-    # Композитный индекс раннего предупреждения 
-    # (взвешенная сумма доли предупреждений и опасностей)
-    df['early_warning_index'] = (
-        (df['total_warnings'] / max_warnings) * 0.4 + 
-        (df['total_dangers'] / max_dangers) * 0.6
-    )
-    
-    # Категоризация уровня предупреждения
-    df['warning_level'] = pd.cut(
-        df['early_warning_index'],
-        bins=[-float('inf'), 0.3, 0.6, 0.8, float('inf')],
-        labels=['Normal', 'Watch', 'Warning', 'Alert']
-    )
+    # Композитный индекс раннего предупреждения и его уровень
+    df['early_warning_index'] = early_warning_index
+    df['warning_level'] = warning_level
     
     return df
 
@@ -276,49 +541,165 @@ def calculate_early_warning_signals(df, metrics, warning_threshold=0.7, danger_t
 # VII. ФУНКЦИИ ПРОГНОЗИРОВАНИЯ (из bubble_forecast.py)
 # ========================================================================
 
-def prepare_time_series_features(series, lookback=12):
+# Признаки prepare_time_series_features (без целевой переменной), в порядке столбцов
+FEATURE_COLUMNS = ['lag_1', 'lag_3', 'lag_6', 'lag_12', 'ma_3', 'ma_6', 'ma_12',
+                   'pct_change_1', 'pct_change_3', 'pct_change_6',
+                   'trend', 'seasonal', 'volatility']
+
+
+def _feature_block(values, lookback=12):
     """
-    Подготовка временного ряда для прогнозирования путем создания признаков
-    
-    Параметры:
-    - series: временной ряд для прогнозирования
-    - lookback: количество исторических периодов для расчета признаков
+    Блок N×(K+1) признаков FEATURE_COLUMNS и целевой переменной (последний столбец)
+    для массива values; строки с недостающей историей содержат NaN
     """
-    df = pd.DataFrame(index=series.index)
+    n = len(values)
+    
+    # Все признаки пишутся в один блок (по столбцам, order='F': DataFrame
+    # строится из него без копирования, столбцы df — непрерывные срезы)
+    features = np.full((n, len(FEATURE_COLUMNS) + 1), np.nan, order='F')
     
     # 1. Лаги (предыдущие значения)
-    for lag in [1, 3, 6, 12]:
-        df[f'lag_{lag}'] = series.shift(lag)
+    for j, lag in enumerate([1, 3, 6, 12]):
+        features[lag:, j] = values[:-lag]
     
     # 2. Скользящие средние
-    for window in [3, 6, 12]:
-        df[f'ma_{window}'] = series.rolling(window=window).mean()
+    for j, window in enumerate([3, 6, 12], start=4):
+        if bn is None or window > n:
+            features[:, j] = pd.Series(values).rolling(window=window).mean()
+        else:
+            features[:, j] = bn.move_mean(values, window=window, min_count=window)
     
     # 3. Темпы изменения
-    for window in [1, 3, 6]:
-        df[f'pct_change_{window}'] = series.pct_change(periods=window)
+    # (пропуски заполняются предыдущим значением, как в pct_change с fill_method='pad')
+    missing = np.isnan(values)
+    filled = values[np.maximum.accumulate(np.where(missing, 0, np.arange(n)))] if missing.any() else values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j, window in enumerate([1, 3, 6], start=7):
+            features[window:, j] = filled[window:] / filled[:-window] - 1
     
     # 4. Расчет тренда на основе линейной регрессии на предыдущих значениях
-    df['trend'] = np.nan
-    for i in range(lookback, len(series) + 1):
-        y_segment = series.iloc[i-lookback:i].values
-        X = np.arange(lookback).reshape(-1, 1)
-        model = LinearRegression()
-        model.fit(X, y_segment)
-        df.loc[df.index[i-1], 'trend'] = model.coef_[0]
+    # (наклон МНК на каждом окне длины lookback, см. _rolling_slope)
+    features[:, 10] = _rolling_slope(values, lookback)
     
     # 5. Сезонность (разница с аналогичным периодом прошлого года)
-    df['seasonal'] = series - series.shift(12)
+    features[12:, 11] = values[12:] - values[:-12]
     
     # 6. Волатильность
-    df['volatility'] = series.rolling(window=lookback).std()
+    if bn is None or lookback > n:
+        features[:, 12] = pd.Series(values).rolling(window=lookback).std()
+    else:
+        features[:, 12] = bn.move_std(values, window=lookback, min_count=lookback, ddof=1)
     
     # Добавляем целевую переменную
-    df['target'] = series
+    features[:, 13] = values
     
+    return features
+
+
+def _prepare_arrays(values, lookback=12):
+    """
+    Признаки и целевая переменная ряда values в виде массивов (X, y) без
+    построения DataFrame — то же, что prepare_time_series_features(...)[FEATURE_COLUMNS]
+    и ['target'] (строки с пропусками отбрасываются одной булевой маской)
+    """
+    features = _feature_block(values, lookback)
+    complete = ~np.isnan(features).any(axis=1)
+    return features[complete, :-1], features[complete, -1]
+
+
+def prepare_time_series_features(series, lookback=12):
+    """
+    Подготовка временного ряда для прогнозирования путем создания признаков
+    
+    Параметры:
+    - series: временной ряд для прогнозирования
+    - lookback: количество исторических периодов для расчета признаков
+    """
+    features = _feature_block(series.to_numpy(dtype=np.float64), lookback)
+    df = pd.DataFrame(features, index=series.index, columns=FEATURE_COLUMNS + ['target'])
     return df.dropna()
 
 
+def _last_feature_row(history, lookback=12):
+    """
+    Признаки FEATURE_COLUMNS только для последней точки history — то же, что
+    prepare_time_series_features(history).iloc[-1], но по хвосту из max(13, lookback)
+    значений, без пересчета всего ряда. None, если в хвосте есть пропуски или он
+    короче нужного (тогда последняя строка prepare_time_series_features отбрасывается
+    dropna и признаки берутся с более ранней даты).
+    """
+    tail = history[-max(13, lookback):]
+    if len(tail) < max(13, lookback) or np.isnan(tail).any():
+        return None
+    last = tail[-1]
+    window = tail[-lookback:]
+    _, x_centered, sum_x2 = _reg_consts(lookback)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.array([
+            tail[-2], tail[-4], tail[-7], tail[-13],
+            tail[-3:].mean(), tail[-6:].mean(), tail[-12:].mean(),
+            last / tail[-2] - 1, last / tail[-4] - 1, last / tail[-7] - 1,
+            x_centered @ window / sum_x2,
+            last - tail[-13],
+            window.std(ddof=1),
+        ])
+
+
+def _rf_predictor(model):
+    """
+    Прогноз обученного случайного леса по одной строке признаков
+    (буфер 1×n_features float32 в C-порядке, см. _forecast_metric).
+    Прогнозы деревьев усредняются напрямую через tree_.predict: то же, что
+    model.predict (тот же порядок суммирования), но без проверки входа и
+    диспетчеризации joblib на каждом вызове.
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    
+    def predict(x):
+        return sum(tree.predict(x)[0, 0] for tree in trees) / len(trees)
+    
+    return predict
+
+
+def _forecast_metric(values, forecast_horizon, n_jobs=1):
+    """
+    Обучение случайного леса на признаках ряда values и пошаговый прогноз
+    на forecast_horizon периодов вперед (возвращает массив прогнозов);
+    n_jobs — число потоков для обучения деревьев
+    """
+    # Подготовка признаков и целевой переменной для обучения (сразу массивами)
+    X, y = _prepare_arrays(values)
+    
+    # Обучение модели случайного леса
+    model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    model.fit(X, y)
+    predict = _rf_predictor(model)
+    
+    # Пошаговое прогнозирование на будущие периоды
+    # (признаки следующего шага считаются по хвосту ряда, а не по всей истории;
+    # место под прогнозы выделено заранее, история не копируется на каждом шаге).
+    # Строка признаков пишется на месте в один буфер float32 в C-порядке — в том
+    # виде, в каком его принимают деревья, без преобразования на каждом шаге
+    n_known = len(values)
+    history = np.empty(n_known + forecast_horizon)
+    history[:n_known] = values
+    feature_buf = np.empty((1, X.shape[1]), dtype=np.float32, order='C')
+    
+    for step in range(forecast_horizon):
+        current = history[:n_known + step]
+        
+        # Подготовка признаков для последней точки
+        last_features = _last_feature_row(current)
+        if last_features is None:
+            last_features = _prepare_arrays(current)[0][-1]
+        
+        # Прогноз следующего значения и добавление его в историю ряда
+        feature_buf[0] = last_features
+        history[n_known + step] = predict(feature_buf)
+    
+    return history[n_known:]
+
+
 def forecast_bubble_metrics(df, forecast_horizon=24, metrics=None):
     """
     Прогнозирование ключевых метрик и индекса пузыря
@@ -341,41 +722,24 @@ def forecast_bubble_metrics(df, forecast_horizon=24, metrics=None):
     future_dates = pd.date_range(start=last_date, periods=forecast_horizon+1, freq='MS')[1:]
     forecasts = pd.DataFrame(index=future_dates)
     
-    # Прогнозирование каждой метрики отдельно
-    for metric in metrics:
-        if metric not in df.columns:
-            continue
-            
-        # Подготовка признаков для обучения
-        features_df = prepare_time_series_features(df[metric])
-        
-        # Разделение на признаки и целевую переменную
-        X = features_df.drop('target', axis=1)
-        y = features_df['target']
-        
-        # Обучение модели случайного леса
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X, y)
-        
-        # Пошаговое прогнозирование на будущие периоды
-        current_df = df.copy()
-        future_values = []
-        
-        for _ in range(forecast_horizon):
-            # Подготовка признаков для последней точки
-            last_features = prepare_time_series_features(current_df[metric]).iloc[-1:].drop('target', axis=1)
-            
-            # Прогноз следующего значения
-            next_value = model.predict(last_features)[0]
-            future_values.append(next_value)
-            
-            # Добавление прогноза в текущий датафрейм
-            next_idx = current_df.index[-1] + pd.DateOffset(months=1)
-            next_row = pd.DataFrame({metric: next_value}, index=[next_idx])
-            current_df = pd.concat([current_df, next_row])
-        
-        # Добавление прогноза в итоговый датафрейм
-        forecasts[metric] = future_values
+    # Прогнозирование каждой метрики отдельно: модели метрик независимы,
+    # поэтому обучение и пошаговый прогноз идут параллельно в отдельных процессах.
+    # Деревья внутри леса обучаются на всех ядрах, только если процесс один
+    # (иначе ядра уже заняты процессами метрик). Строки признаков разных метрик
+    # не объединяются в один predict: у каждой метрики свой лес, так что число
+    # вызовов от этого не уменьшается, а шаги одной метрики зависят друг от друга.
+    # Общий лес с многомерной целью здесь не подходит: признаки каждой метрики
+    # строятся по ее собственному ряду (X у метрик разные), и совместная модель
+    # на объединенных признаках дала бы другие прогнозы
+    available = [metric for metric in metrics if metric in df.columns]
+    n_jobs = max(1, min(len(available), os.cpu_count() or 1))
+    rf_jobs = -1 if n_jobs == 1 else 1
+    paths = Parallel(n_jobs=n_jobs, prefer='processes')(
+        delayed(_forecast_metric)(df[metric].to_numpy(dtype=np.float64), forecast_horizon, rf_jobs)
+        for metric in available
+    )
+    for metric, path in zip(available, paths):
+        forecasts[metric] = path
     
     # Расчет изменений для каждой метрики (относительно последнего известного значения)
     for metric in forecasts.columns:
@@ -384,10 +748,8 @@ def forecast_bubble_metrics(df, forecast_horizon=24, metrics=None):
     
     # Если прогнозируется композитный индекс пузыря, добавляем категоризацию риска
     if 'composite_bubble_score' in forecasts.columns:
-        forecasts['bubble_risk_level'] = pd.cut(
-            forecasts['composite_bubble_score'],
-            bins=[-float('inf'), 0.3, 0.5, 0.7, float('inf')],
-            labels=['Low', 'Medium', 'High', 'Critical']
+        forecasts['bubble_risk_level'] = _bucket_labels(
+            forecasts['composite_bubble_score'], RISK_LEVEL_EDGES, RISK_LEVELS
         )
     
     return forecasts
@@ -425,24 +787,25 @@ def detect_market_regimes(df, n_clusters=4):
         return pd.Series(np.nan, index=df.index)
     
     # Нормализация данных для кластеризации
-    X_scaled = (X - X.mean()) / X.std()
+    # (на массиве float32: K-means работает с ним напрямую, без копии в float64;
+    # std с ddof=1, как X.std() в pandas)
+    X_scaled = X.to_numpy(dtype=np.float32)
+    X_scaled = (X_scaled - X_scaled.mean(axis=0)) / X_scaled.std(axis=0, ddof=1)
     
     # Применение алгоритма K-means для определения кластеров/режимов
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    # (алгоритм Элкана: для малой размерности меньше расчетов расстояний)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10, algorithm='elkan')
     clusters = kmeans.fit_predict(X_scaled)
     
-    # Создание серии с режимами
-    market_regimes = pd.Series(np.nan, index=df.index)
-    market_regimes.loc[X.index] = clusters
+    # Профили кластеров (средние значения для каждой метрики) одним groupby;
+    # reindex оставляет строку NaN для пустого кластера, как mean() пустой выборки
+    profiles = X.groupby(clusters).mean().reindex(range(n_clusters))
     
     # Определение описательных имен для режимов на основе их характеристик
     regime_profiles = {}
     
     for cluster in range(n_clusters):
-        cluster_data = X[market_regimes == cluster]
-        
-        # Профиль кластера (средние значения для каждой метрики)
-        profile = cluster_data.mean()
+        profile = profiles.loc[cluster]
         
         # Определение характеристик режима на основе профиля
         volatility = profile.get('SPX_volatility_21d', np.nan)
@@ -469,13 +832,10 @@ def detect_market_regimes(df, n_clusters=4):
             
         regime_profiles[cluster] = regime_name
     
-    # Создание серии с названиями режимов
-    market_regime_names = market_regimes.copy()
-    for cluster, name in regime_profiles.items():
-        market_regime_names.loc[market_regimes == cluster] = name
+    # Создание серии с названиями режимов: название каждой точки берется из
+    # массива названий по номеру кластера (строки с пропусками остаются NaN)
+    regime_names = np.array([regime_profiles[cluster] for cluster in range(n_clusters)], dtype=object)
+    market_regime_names = np.full(len(df), np.nan, dtype=object)
+    market_regime_names[df[available_features].notna().all(axis=1).to_numpy()] = regime_names[clusters]
     
-    return market_regime_names
-"""
-
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.cluster import KMeans
\ No newline at end of file
+    return pd.Series(market_regime_names, index=df.index)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+LaTeX Table Templates
+Shared Jinja2 environment for the LaTeX tables printed by the generate_*.py scripts.
+
+Tags use LaTeX-style delimiters so they never clash with TeX braces:
+    \\VAR{expr}       - insert a value, e.g. \\VAR{"%.2f"|format(x)}
+    \\BLOCK{for ...}  - control flow (lines holding only a block tag are dropped)
+"""
+
+from jinja2 import Environment
+
+LATEX_ENV = Environment(
+    block_start_string=r'\BLOCK{',
+    block_end_string='}',
+    variable_start_string=r'\VAR{',
+    variable_end_string='}',
+    comment_start_string=r'\#{',
+    comment_end_string='}',
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    autoescape=False,
+)
+
+
+def latex_template(source):
+    """Compile a LaTeX table template once (call at module scope, render per run)"""
+    return LATEX_ENV.from_string(source)